@@ -3,6 +3,8 @@ import requests
 from sqlalchemy import create_engine
 import numpy as np
 
+from feature_backends import InProcessBackend
+
 def get_solar_nasa_power(lon, lat):
     """Obtém irradiação solar da NASA POWER API"""
     try:
@@ -21,26 +23,39 @@ def get_solar_nasa_power(lon, lat):
         print(f"   ⚠️  Erro NASA POWER: {e}")
         return None
 
+def fill_missing_solar_nasa(grid, sample_size=100):
+    """Completa com NASA POWER uma amostra das células sem dado solar"""
+    missing_solar = grid['solar_irradiance'].isna().sum()
+    if missing_solar > 0:
+        print(f"   🛰️  NASA POWER para {missing_solar} células sem dados...")
+        missing_cells = grid[grid['solar_irradiance'].isna()].sample(min(sample_size, missing_solar))
+        
+        from pyproj import Transformer
+        transformer = Transformer.from_crs("EPSG:32724", "EPSG:4326", always_xy=True)
+        for idx, row in missing_cells.iterrows():
+            centroid = row['geometry'].centroid
+            lon, lat = transformer.transform(centroid.x, centroid.y)
+            
+            irrad = get_solar_nasa_power(lon, lat)
+            if irrad:
+                grid.loc[idx, 'solar_irradiance'] = irrad
+        
+        print(f"   ✅ {grid['solar_irradiance'].notna().sum()} células com dados após NASA POWER")
+    
+    return grid
+
 def extract_energy_features(grid, engine, sample_size=100):
     """Extrai features de energia solar e eólica"""
 
     print("   ☀️  Processando solar (ANNUAL)...")
     
     try:
-        solar_data = gpd.read_postgis(
-            "SELECT ANNUAL, geometry FROM atlas_solar_utm", 
-            engine, 
-            geom_col='geometry'
-        )
-        
-        print(f"   📊 Dados solares carregados: {len(solar_data)} polígonos")
+        backend = InProcessBackend()
+        solar_data = backend.load_solar(engine)
         print(f"   📈 Média de irradiação: {solar_data['ANNUAL'].mean():.1f} kWh/m²/dia")
         
         print("   🔄 Fazendo cruzamento espacial...")
-        grid_solar = gpd.sjoin(grid, solar_data, how='left', predicate='intersects')
-        
-        solar_means = grid_solar.groupby('cell_id')['ANNUAL'].mean()
-        grid['solar_irradiance'] = grid['cell_id'].map(solar_means)
+        grid['solar_irradiance'] = backend.solar_irradiance(grid)
         
         print(f"   ✅ {grid['solar_irradiance'].notna().sum()} células com dados solares")
         
@@ -51,21 +66,6 @@ def extract_energy_features(grid, engine, sample_size=100):
     print("   💨 Processando eólica...")
     grid['wind_potential'] = np.nan
     
-    missing_solar = grid['solar_irradiance'].isna().sum()
-    if missing_solar > 0:
-        print(f"   🛰️  NASA POWER para {missing_solar} células sem dados...")
-        missing_cells = grid[grid['solar_irradiance'].isna()].sample(min(sample_size, missing_solar))
-        
-        for idx, row in missing_cells.iterrows():
-            centroid = row['centroid']
-            from pyproj import Transformer
-            transformer = Transformer.from_crs("EPSG:32724", "EPSG:4326", always_xy=True)
-            lon, lat = transformer.transform(centroid.x, centroid.y)
-            
-            irrad = get_solar_nasa_power(lon, lat)
-            if irrad:
-                grid.loc[idx, 'solar_irradiance'] = irrad
-        
-        print(f"   ✅ {grid['solar_irradiance'].notna().sum()} células com dados após NASA POWER")
+    grid = fill_missing_solar_nasa(grid, sample_size)
     
     return grid
\ No newline at end of file
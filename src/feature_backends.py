@@ -0,0 +1,308 @@
+# Backends de execução das features. Os dois calculam as mesmas definições,
+# e a escolha entre eles é só uma questão de desempenho:
+#   - solar_irradiance: média de ANNUAL (ignorando polígonos sem valor)
+#     ponderada pela área de interseção entre a célula e o atlas solar;
+#   - dist_to_uc_km: distância do centroide à UC mais próxima, limitada a
+#     uc_radius_km, para que células distantes continuem no ranking;
+#   - NASA POWER (opcional): nasa_sample_size células sem dado solar,
+#     sorteadas uma vez no grid inteiro, depois de todos os tiles.
+# Se a tabela solar ou a de UCs não existir, só a coluna correspondente
+# fica vazia.
+import geopandas as gpd
+import pandas as pd
+import numpy as np
+from sqlalchemy import text
+
+from grid_analysis import parse_bounds
+
+UTM_EPSG = 32724
+
+FEATURE_COLUMNS = [
+    'solar_irradiance',
+    'wind_potential',
+    'dist_to_uc_km',
+    'pop_density',
+    'dist_to_grid_km',
+    'connection_cost_brl',
+]
+
+# Filtro de tile: o && usa o índice espacial e o intervalo semiaberto no
+# centroide garante que cada célula caia em exatamente um tile.
+TILE_FILTER = """
+    eg.geometry && ST_MakeEnvelope(:minx, :miny, :maxx, :maxy, :srid)
+    AND ST_X(ST_Centroid(eg.geometry)) >= :minx
+    AND ST_X(ST_Centroid(eg.geometry)) < :maxx
+    AND ST_Y(ST_Centroid(eg.geometry)) >= :miny
+    AND ST_Y(ST_Centroid(eg.geometry)) < :maxy
+"""
+
+SOLAR_CTE = """,
+solar AS (
+    SELECT
+        c.cell_id,
+        SUM(asol."ANNUAL" * ia.area)
+            / NULLIF(SUM(ia.area) FILTER (WHERE asol."ANNUAL" IS NOT NULL), 0)
+            AS solar_irradiance
+    FROM cells c
+    JOIN {solar_table} asol
+        ON ST_Intersects(c.geometry, asol.geometry)
+    CROSS JOIN LATERAL (
+        SELECT ST_Area(ST_Intersection(c.geometry, asol.geometry)) AS area
+    ) ia
+    GROUP BY c.cell_id
+)"""
+
+UC_JOIN = """
+LEFT JOIN LATERAL (
+    SELECT ST_Distance(c.cell_centroid, u.geometry) / 1000 AS dist_to_uc_km
+    FROM {uc_table} u
+    WHERE ST_DWithin(c.cell_centroid, u.geometry, :uc_radius_m)
+    ORDER BY u.geometry <-> c.cell_centroid
+    LIMIT 1
+) uc ON true"""
+
+PUSHDOWN_QUERY = """
+WITH cells AS (
+    SELECT eg.*, ST_Centroid(eg.geometry) AS cell_centroid
+    FROM {grid_table} eg
+    WHERE {tile_filter}
+){solar_cte}
+SELECT
+    {grid_columns},
+    {solar_expr} AS solar_irradiance,
+    NULL::double precision AS wind_potential,
+    {uc_expr} AS dist_to_uc_km,
+    NULL::double precision AS pop_density,
+    NULL::double precision AS dist_to_grid_km,
+    NULL::double precision AS connection_cost_brl
+FROM cells c{solar_join}{uc_join}
+"""
+
+def make_tiles(bounds, tile_size_km=None):
+    """Divide a extensão do grid em tiles quadrados (minx, miny, maxx, maxy)"""
+    minx, miny, maxx, maxy = bounds
+    if tile_size_km is None:
+        # Folga no limite superior por causa do intervalo semiaberto
+        return [(minx, miny, maxx + 1, maxy + 1)]
+
+    tile_size_m = tile_size_km * 1000
+    xs = np.arange(minx, maxx + 1, tile_size_m)
+    ys = np.arange(miny, maxy + 1, tile_size_m)
+    return [(x, y, x + tile_size_m, y + tile_size_m) for x in xs for y in ys]
+
+def get_grid_tiles(engine, grid_table='energy_grid', tile_size_km=None):
+    """Lê a extensão do grid no PostGIS e devolve a lista de tiles"""
+    with engine.connect() as conn:
+        result = conn.execute(text(f"SELECT ST_Extent(geometry) FROM {grid_table}"))
+        bounds = parse_bounds(result.scalar())
+    return make_tiles(bounds, tile_size_km)
+
+def tile_params(tile):
+    """Parâmetros SQL do filtro de tile"""
+    minx, miny, maxx, maxy = tile
+    return {
+        'minx': float(minx), 'miny': float(miny),
+        'maxx': float(maxx), 'maxy': float(maxy),
+        'srid': UTM_EPSG,
+    }
+
+def table_exists(engine, table_name):
+    """Verifica se a tabela existe no banco"""
+    with engine.connect() as conn:
+        result = conn.execute(text("SELECT to_regclass(:name)"), {'name': table_name})
+        return result.scalar() is not None
+
+def get_table_columns(engine, table_name):
+    """Lista as colunas de uma tabela, na ordem de criação"""
+    with engine.connect() as conn:
+        result = conn.execute(text("""
+            SELECT column_name
+            FROM information_schema.columns
+            WHERE table_name = :name
+            ORDER BY ordinal_position
+        """), {'name': table_name})
+        return [row[0] for row in result]
+
+class FeatureBackend:
+    """Base dos backends: divide o grid em tiles e junta os resultados"""
+    name = None
+
+    def __init__(self, uc_radius_km=500, nasa_sample_size=0,
+                 solar_table='atlas_solar_utm', uc_table='unidades_conservacao'):
+        self.uc_radius_km = uc_radius_km
+        self.nasa_sample_size = nasa_sample_size
+        self.solar_table = solar_table
+        self.uc_table = uc_table
+
+    def prepare(self, engine, grid_table):
+        """Preparação feita uma vez antes dos tiles"""
+        self.has_solar = table_exists(engine, self.solar_table)
+        self.has_uc = table_exists(engine, self.uc_table)
+        if not self.has_solar:
+            print(f"   ⚠️  Tabela '{self.solar_table}' não encontrada - solar vazio")
+        if not self.has_uc:
+            print(f"   ⚠️  UCs não encontradas ('{self.uc_table}') - pulando")
+
+    def compute(self, engine, grid_table='energy_grid', tile_size_km=None):
+        """Devolve o GeoDataFrame completo de features, tile a tile"""
+        tiles = get_grid_tiles(engine, grid_table, tile_size_km)
+        print(f"   🧩 {len(tiles)} tile(s) - backend '{self.name}'")
+        self.prepare(engine, grid_table)
+        parts = [self.compute_tile(engine, tile, grid_table) for tile in tiles]
+        grid = concat_tiles(parts)
+
+        if self.nasa_sample_size and not grid.empty:
+            from energy_features import fill_missing_solar_nasa
+            grid = fill_missing_solar_nasa(grid, self.nasa_sample_size)
+        return grid
+
+class InProcessBackend(FeatureBackend):
+    """Calcula as features em Python, com as camadas lidas uma única vez"""
+    name = 'in_process'
+
+    def prepare(self, engine, grid_table):
+        super().prepare(engine, grid_table)
+        self.solar = self.load_solar(engine) if self.has_solar else None
+        self.ucs = self.load_ucs(engine) if self.has_uc else None
+
+    def load_solar(self, engine):
+        """Carrega a camada do atlas solar"""
+        self.solar = gpd.read_postgis(
+            f'SELECT "ANNUAL", geometry FROM {self.solar_table}',
+            engine,
+            geom_col='geometry'
+        )
+        print(f"   📊 Dados solares carregados: {len(self.solar)} polígonos")
+        return self.solar
+
+    def load_ucs(self, engine):
+        """Carrega a camada de unidades de conservação"""
+        self.ucs = gpd.read_postgis(
+            f"SELECT geometry FROM {self.uc_table}",
+            engine,
+            geom_col='geometry'
+        )
+        return self.ucs
+
+    def solar_irradiance(self, grid):
+        """Média de ANNUAL ponderada pela área de interseção"""
+        if self.solar is None:
+            return pd.Series(np.nan, index=grid.index)
+
+        minx, miny, maxx, maxy = grid.total_bounds
+        solar = self.solar.cx[minx:maxx, miny:maxy]
+        if solar.empty:
+            return pd.Series(np.nan, index=grid.index)
+
+        pieces = gpd.overlay(grid[['cell_id', 'geometry']], solar,
+                             how='intersection', keep_geom_type=True)
+        pieces = pieces[pieces['ANNUAL'].notna()].copy()
+        pieces['area'] = pieces.geometry.area
+        weighted = (pieces['ANNUAL'] * pieces['area']).groupby(pieces['cell_id']).sum()
+        area = pieces.groupby('cell_id')['area'].sum().replace(0, np.nan)
+        return grid['cell_id'].map(weighted / area)
+
+    def dist_to_uc_km(self, grid, centroids):
+        """Distância à UC mais próxima, limitada a uc_radius_km"""
+        if self.ucs is None:
+            return pd.Series(np.nan, index=grid.index)
+
+        radius_m = self.uc_radius_km * 1000
+        minx, miny, maxx, maxy = grid.total_bounds
+        ucs = self.ucs.cx[minx - radius_m:maxx + radius_m, miny - radius_m:maxy + radius_m]
+        if ucs.empty:
+            return pd.Series(self.uc_radius_km, index=grid.index, dtype=float)
+
+        return centroids.distance(ucs.unary_union).clip(upper=radius_m) / 1000
+
+    def compute_tile(self, engine, tile, grid_table='energy_grid'):
+        grid = gpd.read_postgis(
+            text(f"SELECT eg.* FROM {grid_table} eg WHERE {TILE_FILTER}"),
+            engine,
+            geom_col='geometry',
+            params=tile_params(tile)
+        )
+        if grid.empty:
+            return grid
+
+        grid['solar_irradiance'] = self.solar_irradiance(grid)
+        grid['wind_potential'] = np.nan
+        grid['dist_to_uc_km'] = self.dist_to_uc_km(grid, grid.geometry.centroid)
+        grid['pop_density'] = np.nan
+        grid['dist_to_grid_km'] = np.nan
+        grid['connection_cost_brl'] = np.nan
+        return grid
+
+class PostGISBackend(FeatureBackend):
+    """Calcula as features no PostGIS, com uma consulta por tile"""
+    name = 'postgis'
+
+    def prepare(self, engine, grid_table):
+        super().prepare(engine, grid_table)
+        grid_columns = [
+            col for col in get_table_columns(engine, grid_table)
+            if col not in FEATURE_COLUMNS
+        ]
+        self.query = self.build_query(grid_table, grid_columns)
+
+    def build_query(self, grid_table, grid_columns):
+        if self.has_solar:
+            solar_cte = SOLAR_CTE.format(solar_table=self.solar_table)
+            solar_expr = 's.solar_irradiance'
+            solar_join = '\nLEFT JOIN solar s ON s.cell_id = c.cell_id'
+        else:
+            solar_cte, solar_expr, solar_join = '', 'NULL::double precision', ''
+
+        if self.has_uc:
+            uc_expr = 'COALESCE(uc.dist_to_uc_km, :uc_radius_m / 1000.0)'
+            uc_join = UC_JOIN.format(uc_table=self.uc_table)
+        else:
+            uc_expr, uc_join = 'NULL::double precision', ''
+
+        return PUSHDOWN_QUERY.format(
+            grid_table=grid_table,
+            tile_filter=TILE_FILTER,
+            solar_cte=solar_cte,
+            grid_columns=', '.join(f'c."{col}"' for col in grid_columns),
+            solar_expr=solar_expr,
+            uc_expr=uc_expr,
+            solar_join=solar_join,
+            uc_join=uc_join,
+        )
+
+    def compute_tile(self, engine, tile, grid_table='energy_grid'):
+        params = tile_params(tile)
+        if self.has_uc:
+            params['uc_radius_m'] = self.uc_radius_km * 1000
+        return gpd.read_postgis(
+            text(self.query),
+            engine,
+            geom_col='geometry',
+            params=params
+        )
+
+def concat_tiles(parts):
+    """Junta os resultados dos tiles num único GeoDataFrame"""
+    parts = [p for p in parts if not p.empty]
+    if not parts:
+        return gpd.GeoDataFrame(
+            columns=['cell_id', 'geometry'] + FEATURE_COLUMNS,
+            geometry='geometry',
+            crs=f"EPSG:{UTM_EPSG}"
+        )
+    grid = pd.concat(parts, ignore_index=True)
+    grid = gpd.GeoDataFrame(grid, geometry='geometry', crs=parts[0].crs)
+    for col in FEATURE_COLUMNS:
+        grid[col] = pd.to_numeric(grid[col], errors='coerce')
+    return grid
+
+BACKENDS = {
+    InProcessBackend.name: InProcessBackend,
+    PostGISBackend.name: PostGISBackend,
+}
+
+def get_backend(name='postgis', **kwargs):
+    """Instancia o backend de execução pelo nome ('postgis' ou 'in_process')"""
+    if name not in BACKENDS:
+        raise ValueError(f"Backend desconhecido: {name}. Opções: {list(BACKENDS)}")
+    return BACKENDS[name](**kwargs)
@@ -2,17 +2,15 @@ import geopandas as gpd
 from sqlalchemy import create_engine
 import numpy as np
 
+from feature_backends import InProcessBackend
+
 def extract_impact_features(grid, engine):
     """Extrai features de impacto ambiental"""
     print("   🏞️  Calculando distância a UCs...")
     try:
-        ucs = gpd.read_postgis(
-            "SELECT * FROM unidades_conservacao", 
-            engine, 
-            geom_col='geometry'
-        )
-        ucs_union = ucs.unary_union
-        grid['dist_to_uc_km'] = grid['centroid'].distance(ucs_union) / 1000
+        backend = InProcessBackend()
+        backend.load_ucs(engine)
+        grid['dist_to_uc_km'] = backend.dist_to_uc_km(grid, grid['centroid'])
     except:
         print("   ⚠️  UCs não encontradas - pulando")
         grid['dist_to_uc_km'] = np.nan
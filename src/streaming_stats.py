@@ -0,0 +1,186 @@
+import copy
+
+import numpy as np
+import pandas as pd
+
+class QuantileSketch:
+    """
+    Sketch de quantis mergeável no estilo KLL.
+
+    Os valores ficam em níveis; um item no nível h pesa 2**h. Quando um
+    nível passa da capacidade, ele é ordenado e metade dos itens (pares ou
+    ímpares, ao acaso) sobe para o nível seguinte. Enquanto nenhuma
+    compactação ocorrer, os quantis são exatos.
+    """
+
+    def __init__(self, k=200, seed=None):
+        self.k = k
+        self.n = 0
+        self.compacted = False
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self):
+        h = 0
+        while h < len(self.levels):
+            if len(self.levels[h]) > self._capacity(h):
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+
+                items = np.sort(self.levels[h])
+                leftover = items[len(items) - len(items) % 2:]
+                items = items[:len(items) - len(items) % 2]
+
+                offset = self._rng.integers(2)
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], items[offset::2]])
+                self.levels[h] = leftover
+                self.compacted = True
+            h += 1
+
+    def update(self, values):
+        """Adiciona um bloco de valores (NaN são ignorados)"""
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return self
+
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self.n += values.size
+        self._compress()
+        return self
+
+    def merge(self, other):
+        """Incorpora outro sketch (ex.: calculado em outro tile ou worker)"""
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for h, items in enumerate(other.levels):
+            self.levels[h] = np.concatenate([self.levels[h], items])
+
+        self.n += other.n
+        self.compacted = self.compacted or other.compacted
+        self._compress()
+        return self
+
+    def quantile(self, q):
+        """Quantil q em [0,1]; NaN se o sketch estiver vazio"""
+        if self.n == 0:
+            return np.nan
+        if not self.compacted:
+            return float(np.quantile(self.levels[0], q))
+
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([
+            np.full(len(items), 2 ** h) for h, items in enumerate(self.levels)
+        ])
+        order = np.argsort(values)
+        values, cum_weights = values[order], np.cumsum(weights[order])
+
+        idx = np.searchsorted(cum_weights, q * cum_weights[-1], side='left')
+        return float(values[min(idx, len(values) - 1)])
+
+    def rank_error(self):
+        """
+        Erro de rank normalizado esperado (confiança de ~99%), pela fórmula
+        empírica do KLL: ~1.3% com k=200. Zero enquanto o sketch é exato.
+        """
+        if not self.compacted:
+            return 0.0
+        return 2.296 / self.k ** 0.9723
+
+class StreamingSummary:
+    """
+    Resumo mergeável de uma coluna: contagem, mín/máx exatos, média e
+    variância (Chan et al.) e um QuantileSketch para percentis.
+    """
+
+    def __init__(self, k=200, seed=None):
+        self.count = 0
+        self.nulls = 0
+        self.min = np.nan
+        self.max = np.nan
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.sketch = QuantileSketch(k=k, seed=seed)
+
+    def _merge_moments(self, count, mean, m2):
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean = self.mean + delta * count / total
+        self.m2 = self.m2 + m2 + delta ** 2 * self.count * count / total
+        self.count = total
+
+    def update(self, s):
+        """Atualiza o resumo com um bloco (Series ou array)"""
+        values = pd.to_numeric(pd.Series(s), errors='coerce').to_numpy(dtype=float)
+        valid = values[~np.isnan(values)]
+        self.nulls += len(values) - len(valid)
+        if valid.size == 0:
+            return self
+
+        self.min = np.nanmin([self.min, valid.min()])
+        self.max = np.nanmax([self.max, valid.max()])
+        self._merge_moments(valid.size, valid.mean(), ((valid - valid.mean()) ** 2).sum())
+        self.sketch.update(valid)
+        return self
+
+    def merge(self, other):
+        """Combina com o resumo de outro bloco"""
+        self.nulls += other.nulls
+        if other.count == 0:
+            return self
+
+        self.min = np.nanmin([self.min, other.min])
+        self.max = np.nanmax([self.max, other.max])
+        self._merge_moments(other.count, other.mean, other.m2)
+        self.sketch.merge(other.sketch)
+        return self
+
+    @property
+    def std(self):
+        if self.count < 2:
+            return np.nan
+        return np.sqrt(self.m2 / (self.count - 1))
+
+    def quantile(self, q):
+        """Percentil q; os extremos 0 e 1 devolvem mín/máx exatos"""
+        if self.count == 0:
+            return np.nan
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        return self.sketch.quantile(q)
+
+def summarize_frame(df, columns, k=200, seed=None):
+    """
+    Calcula os resumos das colunas de um bloco/tile do grid. Cada worker
+    deve usar uma semente própria (ex.: np.random.SeedSequence().spawn),
+    senão as compactações de todos os blocos fazem as mesmas escolhas.
+    """
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    seeds = seed.spawn(len(columns))
+    summaries = {}
+    for col, col_seed in zip(columns, seeds):
+        summaries[col] = StreamingSummary(k=k, seed=col_seed)
+        if col in df.columns:
+            summaries[col].update(df[col])
+    return summaries
+
+def merge_summaries(parts):
+    """
+    Combina uma lista de dicionários {coluna: StreamingSummary} num novo
+    dicionário, sem alterar os resumos de entrada.
+    """
+    merged = {}
+    for part in parts:
+        for col, summary in part.items():
+            if col in merged:
+                merged[col].merge(summary)
+            else:
+                merged[col] = copy.deepcopy(summary)
+    return merged
@@ -0,0 +1,98 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from streaming_stats import QuantileSketch, StreamingSummary, summarize_frame, merge_summaries
+
+QUANTILES = [0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99]
+
+def make_column(rng, kind, n):
+    if kind == 'normal':
+        return rng.normal(5, 1, n)
+    if kind == 'lognormal':
+        return rng.lognormal(0, 1.5, n)
+    if kind == 'uniform':
+        return rng.uniform(0, 1, n)
+    return rng.exponential(2, n)
+
+def rank_of(sorted_values, value):
+    return np.searchsorted(sorted_values, value, side='right') / len(sorted_values)
+
+def merged_summary(x, n_chunks, seed):
+    seeds = np.random.SeedSequence(seed).spawn(n_chunks)
+    parts = [
+        summarize_frame(pd.DataFrame({'a': chunk}), ['a'], seed=chunk_seed)
+        for chunk, chunk_seed in zip(np.array_split(x, n_chunks), seeds)
+    ]
+    return merge_summaries(parts)['a']
+
+def test_merged_moments_match_whole_column():
+    rng = np.random.default_rng(0)
+    x = np.concatenate([rng.normal(5, 1, 100000), [1e4, np.nan]])
+    summary = merged_summary(x, 37, seed=1)
+
+    valid = x[~np.isnan(x)]
+    assert summary.count == len(valid)
+    assert summary.nulls == 1
+    assert summary.min == valid.min()
+    assert summary.max == valid.max()
+    assert summary.mean == pytest.approx(valid.mean(), rel=1e-12)
+    assert summary.std == pytest.approx(valid.std(ddof=1), rel=1e-9)
+
+def test_merge_summaries_does_not_mutate_inputs():
+    rng = np.random.default_rng(0)
+    parts = [summarize_frame(pd.DataFrame({'a': rng.normal(size=1000)}), ['a']) for _ in range(3)]
+    counts = [part['a'].count for part in parts]
+    merged = merge_summaries(parts)
+
+    assert merged['a'].count == sum(counts)
+    assert [part['a'].count for part in parts] == counts
+
+def test_sketch_is_exact_before_compaction():
+    x = np.random.default_rng(0).normal(size=150)
+    sketch = QuantileSketch(k=200).update(x)
+
+    assert sketch.rank_error() == 0.0
+    for q in QUANTILES:
+        assert sketch.quantile(q) == pytest.approx(np.quantile(x, q))
+
+@pytest.mark.parametrize('n_chunks', [2, 40, 1000])
+def test_merged_rank_error_within_bound(n_chunks):
+    for trial in range(12):
+        rng = np.random.default_rng(trial)
+        kind = ['normal', 'lognormal', 'uniform', 'exponential'][trial % 4]
+        x = make_column(rng, kind, 100000)
+        summary = merged_summary(x, n_chunks, seed=trial)
+        xs = np.sort(x)
+
+        bound = summary.sketch.rank_error()
+        assert bound > 0
+        for q in QUANTILES:
+            assert abs(rank_of(xs, summary.quantile(q)) - q) <= bound
+
+def test_sequential_updates_rank_error_within_bound():
+    for trial in range(12):
+        rng = np.random.default_rng(trial)
+        x = make_column(rng, 'lognormal', 200000)
+        summary = StreamingSummary(seed=trial)
+        for chunk in np.array_split(x, 4):
+            summary.update(chunk)
+        xs = np.sort(x)
+
+        for q in QUANTILES:
+            assert abs(rank_of(xs, summary.quantile(q)) - q) <= summary.sketch.rank_error()
+
+def test_robust_scale_with_full_range_matches_minmax():
+    scoring = pytest.importorskip('scoring')
+    rng = np.random.default_rng(0)
+    s = pd.Series(np.concatenate([rng.lognormal(0, 1.5, 50000), [np.nan]]))
+    summary = merged_summary(s.to_numpy(), 10, seed=0)
+
+    expected = scoring.minmax(s)
+    result = scoring.robust_scale(s, summary, 0, 1)
+    pd.testing.assert_series_equal(result, expected)